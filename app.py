@@ -8,6 +8,7 @@ from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from dotenv import load_dotenv
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from vector_index import TIME_SLOTS, get_hour_from_time_string, load_or_build_index
 
 
 load_dotenv()
@@ -44,16 +45,13 @@ except Exception as e:
     print(f"An error occurred while loading local flight data: {e}")
     flight_data_df = pd.DataFrame() 
 
-
-TIME_SLOTS = {
-    "early morning": {"start": 5, "end": 8},
-    "morning": {"start": 8, "end": 12},
-    "noon": {"start": 12, "end": 14},
-    "afternoon": {"start": 14, "end": 18},
-    "evening": {"start": 18, "end": 21},
-    "night": {"start": 21, "end": 24},
-    "midnight": {"start": 0, "end": 5}
-}
+flight_index = None
+if not flight_data_df.empty:
+    try:
+        flight_index = load_or_build_index(flight_data_df)
+    except Exception as e:
+        print(f"An error occurred while building the vector index: {e}")
+        flight_index = None
 
 AIRLINE_INFO = {
     "Air India": "Air India is India's flag carrier, known for its extensive network and full-service experience.",
@@ -67,11 +65,6 @@ AIRLINE_INFO = {
     
 }
 
-def get_hour_from_time_string(time_str):
-    try:
-        return int(time_str.split(':')[0])
-    except (ValueError, AttributeError):
-        return -1
 try:
     gemini_api_key = os.getenv("GEMINI_API_KEY")
     if not gemini_api_key:
@@ -201,6 +194,15 @@ def index():
             </button>
         </form>
 
+        <form id="searchForm" class="space-y-3">
+            <label for="query" class="block text-sm font-medium text-gray-700 mb-1">Or describe the flight you want:</label>
+            <input type="text" id="query" name="query" class="mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-indigo-500 focus:ring-indigo-500 sm:text-sm" placeholder="e.g. evening IndiGo out of Bengaluru on weekends">
+            <button type="submit" class="gradient-button w-full flex items-center justify-center">
+                Search Flights
+                <div id="searchSpinner" class="loading-spinner ml-3"></div>
+            </button>
+        </form>
+
         <div id="results" class="result-box mt-8 text-gray-800">
             <p class="text-center text-gray-500">Enter your flight preferences and click "Find Flights" to get AI-powered suggestions.</p>
         </div>
@@ -281,6 +283,42 @@ def index():
                 loadingSpinner.style.display = 'none'; // Hide spinner
             }
         });
+
+        document.getElementById('searchForm').addEventListener('submit', async (event) => {
+            event.preventDefault();
+            const resultsDiv = document.getElementById('results');
+            const searchSpinner = document.getElementById('searchSpinner');
+
+            resultsDiv.innerHTML = '<p class="text-center text-gray-500">Searching for flights...</p>';
+            searchSpinner.style.display = 'block';
+
+            try {
+                const response = await fetch('/search_flights', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json'
+                    },
+                    body: JSON.stringify({ query: document.getElementById('query').value })
+                });
+
+                const result = await response.json();
+                if (result.error) {
+                    resultsDiv.innerHTML = `<p class="text-red-600">Error: ${result.error}</p>`;
+                } else if (result.flights.length === 0) {
+                    resultsDiv.innerHTML = '<p class="text-center text-gray-500">No flights matched your search.</p>';
+                } else {
+                    resultsDiv.innerHTML = result.flights.map(f =>
+                        `<p><b>${f.airline} ${f.flightNumber}</b>: ${f.origin} &rarr; ${f.destination}, departs ${f.scheduledDepartureTime}, arrives ${f.scheduledArrivalTime} (${f.dayOfWeek})</p>`
+                    ).join('');
+                }
+
+            } catch (error) {
+                console.error('Error:', error);
+                resultsDiv.innerHTML = `<p class="text-red-600">Failed to search flights. Please try again. (${error.message})</p>`;
+            } finally {
+                searchSpinner.style.display = 'none';
+            }
+        });
     </script>
 </body>
 </html>
@@ -519,5 +557,41 @@ def find_flights():
         print(f"An unexpected error occurred during AI processing: {e}")
         return jsonify({"error": f"An internal error occurred: {e}"}), 500
 
+@app.route('/search_flights', methods=['POST'])
+def search_flights():
+    """
+    Free-text semantic search over every indexed flight, e.g. "cheap evening IndiGo out of Bengaluru on weekends".
+    Airline, day, time slot and city filters are read from the query and applied before the top-k search.
+    """
+    if flight_index is None:
+        return jsonify({"error": f"Vector index not available. Please run 'prepare_local_data.py' to create {LOCAL_DATA_FILE} first."}), 500
+
+    if query_embeddings_model is None:
+        return jsonify({"error": "Gemini embedding model for queries not initialized. Check GEMINI_API_KEY."}), 500
+
+    search_request = request.get_json() or {}
+    query = (search_request.get('query') or '').strip()
+    if not query:
+        return jsonify({"error": "Missing search query."}), 400
+
+    try:
+        top_k = max(1, min(int(search_request.get('topK', 10)), 50))
+    except (TypeError, ValueError):
+        return jsonify({"error": "topK must be a number."}), 400
+
+    filters = flight_index.parse_query(query)
+
+    print(f"Received search: {query!r} with filters {filters}")
+
+    try:
+        query_embedding = query_embeddings_model.embed_query(query)
+        results = flight_index.search(query_embedding, top_k=top_k, **filters)
+    except Exception as e:
+        print(f"Error during semantic flight search: {e}")
+        return jsonify({"error": f"An internal error occurred: {e}"}), 500
+
+    results['similarity'] = results['similarity'].astype(float).round(4)
+    return jsonify({"filters": filters, "flights": results.to_dict(orient='records')})
+
 if __name__ == '__main__':
     app.run(host='127.0.0.1', port=8080)
\ No newline at end of file
@@ -0,0 +1,298 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+INDEX_DIR = 'flight_index'
+VECTOR_SHARD_FILE = 'vectors_{:04d}.npy'
+ROWS_FILE = 'rows.csv'
+MANIFEST_FILE = 'manifest.json'
+
+ROW_COLUMNS = ['flightNumber', 'airline', 'origin', 'destination', 'dayOfWeek', 'scheduledDepartureTime', 'scheduledArrivalTime']
+
+TIME_SLOTS = {
+    "early morning": {"start": 5, "end": 8},
+    "morning": {"start": 8, "end": 12},
+    "noon": {"start": 12, "end": 14},
+    "afternoon": {"start": 14, "end": 18},
+    "evening": {"start": 18, "end": 21},
+    "night": {"start": 21, "end": 24},
+    "midnight": {"start": 0, "end": 5}
+}
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+DAY_GROUPS = {
+    "weekends": ['Saturday', 'Sunday'],
+    "weekend": ['Saturday', 'Sunday'],
+    "weekdays": DAYS[:5],
+    "weekday": DAYS[:5],
+}
+
+# Names people type in queries that differ from the airline column in the dataset.
+AIRLINE_ALIASES = {
+    "indigo": "TestIndigo",
+    "go first": "GoAir",
+    "go air": "GoAir",
+    "airasia": "AirAsia India",
+    "air asia": "AirAsia India",
+}
+
+# A slot word right after "arriving (at/in the)" or right before "arrival" filters on arrival time.
+ARRIVAL_BEFORE_SLOT = re.compile(r'\barriv(?:e|es|ing|al)(?:\s+(?:at|in|by|around|before|after|during|the))*\s*$')
+ARRIVAL_AFTER_SLOT = re.compile(r'\s+arrivals?\b')
+
+
+def get_hour_from_time_string(time_str):
+    try:
+        return int(time_str.split(':')[0])
+    except (ValueError, AttributeError):
+        return -1
+
+
+def hour_in_slot(hours, slot):
+    """Returns a boolean mask of the hours that fall inside a TIME_SLOTS entry."""
+    if slot['start'] <= slot['end']:
+        return (hours >= slot['start']) & (hours < slot['end'])
+    return (hours >= slot['start']) | (hours < slot['end'])
+
+
+def day_mask(days):
+    """Packs a list of day names into a 7-bit mask (bit 0 = Monday)."""
+    mask = 0
+    for day in days:
+        day = day.strip().capitalize()
+        if day in DAYS:
+            mask |= 1 << DAYS.index(day)
+    return mask
+
+
+def row_keys(df):
+    """Builds a stable key per row so the index can tell which rows it has already seen."""
+    base = df[ROW_COLUMNS].astype(str).fillna('').agg('|'.join, axis=1)
+    occurrence = base.groupby(base).cumcount().astype(str)
+    return (base + '#' + occurrence).tolist()
+
+
+class FlightVectorIndex:
+    """
+    Persistent on-disk index over the per-row flight embeddings.
+
+    Vectors are stored L2-normalised in a single float32 matrix so a query is one
+    matrix-vector product, and airline/day/slot metadata is kept alongside as
+    columns so rows can be masked out before scoring. On disk each update writes
+    its vectors to a new shard file, so existing shards are never rewritten.
+    """
+
+    def __init__(self, index_dir=INDEX_DIR):
+        self.index_dir = index_dir
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.rows = pd.DataFrame(columns=ROW_COLUMNS + ['key', 'dep_hour', 'arr_hour', 'day_mask'])
+        self.keys = []
+        self.shards = []
+        self._lowered = {}
+
+    def _cache_columns(self):
+        # Lower-cased text columns are kept as arrays so filtering does not redo string work per query.
+        self._lowered = {col: self.rows[col].str.lower().to_numpy() for col in ['airline', 'origin', 'destination']}
+
+    def _path(self, name):
+        return os.path.join(self.index_dir, name)
+
+    def load(self):
+        """Loads the index from disk. Returns False if there is nothing usable there."""
+        try:
+            with open(self._path(MANIFEST_FILE)) as f:
+                manifest = json.load(f)
+            shards = manifest.get('shards', [])
+            vectors = np.concatenate([np.load(self._path(shard)) for shard in shards]) if shards else np.zeros((0, 0), dtype=np.float32)
+            rows = pd.read_csv(self._path(ROWS_FILE), dtype=str, keep_default_na=False)
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"Could not read vector index from {self.index_dir}: {e}")
+            return False
+
+        if len(rows) != len(vectors) or manifest.get('count') != len(vectors):
+            print(f"Vector index in {self.index_dir} is inconsistent; it will be rebuilt.")
+            return False
+
+        for col in ['dep_hour', 'arr_hour', 'day_mask']:
+            rows[col] = rows[col].astype(int)
+        self.vectors = vectors.astype(np.float32, copy=False)
+        self.rows = rows
+        self.keys = rows['key'].tolist()
+        self.shards = shards
+        self._cache_columns()
+        return True
+
+    def save(self, new_rows, new_vectors, rebuild):
+        """
+        Writes an update to disk. New vectors go to their own shard file and new rows
+        are appended to the rows file; on a rebuild the old shards are removed and
+        everything is written fresh. The manifest is written last, so an interrupted
+        save leaves counts that do not match and the next load rebuilds.
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        if rebuild:
+            for shard in self.shards:
+                if os.path.exists(self._path(shard)):
+                    os.remove(self._path(shard))
+            self.shards = []
+
+        shard = VECTOR_SHARD_FILE.format(len(self.shards))
+        np.save(self._path(shard), new_vectors)
+        self.shards.append(shard)
+
+        if rebuild or not os.path.exists(self._path(ROWS_FILE)):
+            self.rows.to_csv(self._path(ROWS_FILE), index=False)
+        else:
+            new_rows.to_csv(self._path(ROWS_FILE), mode='a', header=False, index=False)
+        with open(self._path(MANIFEST_FILE), 'w') as f:
+            json.dump({'count': len(self.rows), 'dimension': int(self.vectors.shape[1]), 'shards': self.shards}, f)
+
+    def update(self, df):
+        """
+        Brings the index in line with a DataFrame that has an 'embedding' column.
+
+        Rows already in the index are left untouched and only unseen rows are
+        normalised and appended. If rows have disappeared from the DataFrame or the
+        embedding size changed, the index is rebuilt from scratch.
+        """
+        df = df[df['embedding'].apply(lambda x: isinstance(x, np.ndarray))].copy()
+        if df.empty:
+            print("No embeddings available to index.")
+            return
+
+        keys = row_keys(df)
+        dimension = len(df['embedding'].iloc[0])
+        known = set(self.keys)
+        current = set(keys)
+
+        rebuild = not self.keys or not known.issubset(current) or self.vectors.shape[1] != dimension
+        if rebuild:
+            self.vectors = np.zeros((0, dimension), dtype=np.float32)
+            self.rows = self.rows.iloc[0:0]
+            self.keys = []
+            known = set()
+
+        is_new = [key not in known for key in keys]
+        added = df[is_new]
+        if added.empty:
+            print(f"Vector index is up to date ({len(self.keys)} rows).")
+            return
+
+        new_vectors = np.vstack(added['embedding'].tolist()).astype(np.float32)
+        norms = np.linalg.norm(new_vectors, axis=1, keepdims=True)
+        new_vectors /= np.where(norms == 0, 1, norms)
+
+        new_rows = added[ROW_COLUMNS].astype(str).fillna('')
+        new_rows['key'] = [key for key, new in zip(keys, is_new) if new]
+        new_rows['dep_hour'] = new_rows['scheduledDepartureTime'].apply(get_hour_from_time_string)
+        new_rows['arr_hour'] = new_rows['scheduledArrivalTime'].apply(get_hour_from_time_string)
+        new_rows['day_mask'] = new_rows['dayOfWeek'].apply(lambda x: day_mask(x.split(',')))
+
+        self.vectors = np.vstack([self.vectors, new_vectors])
+        self.rows = pd.concat([self.rows, new_rows], ignore_index=True) if len(self.rows) else new_rows.reset_index(drop=True)
+        self.keys.extend(new_rows['key'])
+        self._cache_columns()
+        self.save(new_rows, new_vectors, rebuild)
+        print(f"{'Rebuilt' if rebuild else 'Updated'} vector index: added {len(new_rows)} rows, {len(self.keys)} total.")
+
+    def filter_mask(self, airlines=None, days=None, departure_slot=None, arrival_slot=None, origin=None, destination=None):
+        """Returns a boolean mask over indexed rows matching the given metadata filters."""
+        mask = np.ones(len(self.rows), dtype=bool)
+        if airlines:
+            mask &= np.isin(self._lowered['airline'], [a.lower() for a in airlines])
+        if days:
+            mask &= (self.rows['day_mask'].to_numpy() & day_mask(days)) != 0
+        if departure_slot in TIME_SLOTS:
+            mask &= hour_in_slot(self.rows['dep_hour'].to_numpy(), TIME_SLOTS[departure_slot])
+        if arrival_slot in TIME_SLOTS:
+            mask &= hour_in_slot(self.rows['arr_hour'].to_numpy(), TIME_SLOTS[arrival_slot])
+        if origin:
+            mask &= self._lowered['origin'] == origin.lower()
+        if destination:
+            mask &= self._lowered['destination'] == destination.lower()
+        return mask
+
+    def search(self, query_embedding, top_k=10, **filters):
+        """Returns the top_k indexed rows by cosine similarity among those passing the filters."""
+        candidates = np.flatnonzero(self.filter_mask(**filters))
+        if candidates.size == 0:
+            return self.rows.iloc[0:0][ROW_COLUMNS].assign(similarity=[])
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1)
+
+        if candidates.size == len(self.rows):
+            scores = self.vectors @ query
+        else:
+            scores = self.vectors[candidates] @ query
+
+        k = min(top_k, candidates.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = self.rows.iloc[candidates[top]][ROW_COLUMNS].copy()
+        results['similarity'] = scores[top]
+        return results.reset_index(drop=True)
+
+    def parse_query(self, text):
+        """
+        Pulls metadata filters out of a free-text query such as
+        "cheap evening IndiGo out of Bengaluru on weekends".
+
+        Recognises airline names (and common aliases), day names and groups like
+        "weekends", TIME_SLOTS names as the departure slot (or the arrival slot when
+        they follow "arrive"/"arriving"/"arrival"), and cities preceded by
+        "from"/"out of" (origin) or "to" (destination).
+        """
+        lowered = text.lower()
+        filters = {}
+
+        airlines = {a.lower(): a for a in self.rows['airline'].unique()}
+        airlines.update({alias: name for alias, name in AIRLINE_ALIASES.items() if name.lower() in airlines})
+        matched = {name for word, name in airlines.items() if re.search(rf'\b{re.escape(word)}\b', lowered)}
+        if matched:
+            filters['airlines'] = sorted(matched)
+
+        days = []
+        for group, group_days in DAY_GROUPS.items():
+            if re.search(rf'\b{group}\b', lowered):
+                days.extend(group_days)
+        for day in DAYS:
+            if re.search(rf'\b{day.lower()}s?\b', lowered):
+                days.append(day)
+        if days:
+            filters['days'] = sorted(set(days), key=DAYS.index)
+
+        # Longest slot names first so "early morning" is not also read as "morning".
+        remaining = lowered
+        for slot in sorted(TIME_SLOTS, key=len, reverse=True):
+            for match in re.finditer(rf'\b{slot}\b', remaining):
+                before, after = remaining[:match.start()], remaining[match.end():]
+                if ARRIVAL_BEFORE_SLOT.search(before) or ARRIVAL_AFTER_SLOT.match(after):
+                    filters.setdefault('arrival_slot', slot)
+                else:
+                    filters.setdefault('departure_slot', slot)
+            remaining = re.sub(rf'\b{slot}\b', ' ', remaining)
+
+        cities = set(self._lowered['origin']) | set(self._lowered['destination'])
+        for city in sorted(cities, key=len, reverse=True):
+            if 'origin' not in filters and re.search(rf'\b(?:from|out of)\s+{re.escape(city)}\b', lowered):
+                filters['origin'] = city
+            if 'destination' not in filters and re.search(rf'\bto\s+{re.escape(city)}\b', lowered):
+                filters['destination'] = city
+        return filters
+
+
+def load_or_build_index(df, index_dir=INDEX_DIR):
+    """Loads the persisted index and adds any rows of df it has not seen yet."""
+    index = FlightVectorIndex(index_dir)
+    if index.load():
+        print(f"Vector index loaded from {index_dir} ({len(index.keys)} rows).")
+    index.update(df)
+    return index